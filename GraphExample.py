@@ -12,6 +12,8 @@ class GraphObject(object):
     
     The intent is to provide a collection of factory methods for graph classes. 
     """
+    __slots__ = ()      ## so that subclasses declaring __slots__ carry no per-instance __dict__
+    
     def __init__(self):
         """
         No further initialization is necessary as this class never does anything.
@@ -23,6 +25,8 @@ class GraphObject(object):
         """
         Reads in a graph from a file as a list of vertex pairs.
         
+        Every line of exactly two tokens is an edge, and ValueError is raised if either 
+        token is not an integer. 
         
         @type cls: A subclass of B{GraphObject}. 
         @param cls: The class of object we wish to create.
@@ -31,25 +35,18 @@ class GraphObject(object):
         @rtype: An object of type cls.
         @return: A graph corresponding to vertex-edge data from the given file. 
         """
-        edges = []
-        verts=set([])
+        import itertools
         try:
-            ff = open(fileName, 'r')
-            for ll in ff:
-                ss = ll.strip()
-                ls = ss.split(" ")
-                if len(ls)==2:
-                    a, b = int(ls[0]), int(ls[1])
-                    edges.append((a,b))
-                    verts.update([a,b])
-            
-            ff.close()
-            return cls(list(verts), edges)
-        except IOError:
+            with open(fileName, 'r') as ff:
+                rows = (ll.split() for ll in ff)        ## any run of whitespace separates, and ends need no strip
+                edges = [(int(ls[0]), int(ls[1])) for ls in rows if len(ls)==2]
+        except OSError:
             return cls([], [])
+        verts = set(itertools.chain.from_iterable(edges))     ## one pass over all endpoints
+        return cls(list(verts), edges)
             
     @classmethod
-    def random(cls, vertCount, edgeCount):
+    def random(cls, vertCount, edgeCount, seed=None):
         """
         Creates a graph with vertCount vertices and at most edgeCount edges in a random fashion.        
         
@@ -58,14 +55,25 @@ class GraphObject(object):
         @type vertCount: int
         @param vertCount: The number of vertices this graph is to have.
         @type edgeCount: int
-        @param edgeCount: The maximum number of edges this graph is to have. This is not exact as we do nothing to prevent duplicate edges. 
+        @param edgeCount: The maximum number of edges this graph is to have. This is not exact as duplicate edges are drawn and then discarded. 
+        @type seed: hashable
+        @param seed: The seed for the random generator, so that a graph can be reproduced. By default a fresh seed is used.
         @rtype: An object of type cls.
-        @return: A random graph.  
+        @return: A random graph with no loops or duplicate edges.  
         """
         import random 
         verts = range(vertCount)
-        edges = [random.sample(verts, 2) for i in range(edgeCount)]
-        return cls(verts, edges)
+        if vertCount < 2:
+            return cls(verts, [])
+        rnd = random.Random(seed).random      ## a private generator, so seeding does not disturb the global one
+        edges = set()
+        for i in range(edgeCount):
+            a = int(rnd() * vertCount)
+            b = int(rnd() * (vertCount - 1))
+            if b >= a:          ## skip over a, so b is uniform on the other vertices and there are no loops
+                b += 1
+            edges.add((a, b) if a < b else (b, a))
+        return cls(verts, list(edges))
         
     @classmethod
     def complete(cls, size=3):
@@ -79,8 +87,9 @@ class GraphObject(object):
         @rtype: An object of type cls.
         @return: A complete graph of size I{size}.  
         """
+        import itertools
         verts = range(size)
-        edges = [(i, j) for i in verts for j in range(i+1, size)]
+        edges = list(itertools.combinations(verts, 2))      ## pairs are generated in C, in the same order
         return cls(verts, edges)
         
     @classmethod
@@ -96,7 +105,7 @@ class GraphObject(object):
         @return: A path graph of length I{length}.  
         """
         verts = range(length+1)
-        edges = [(i, i+1) for i in range(length)]
+        edges = list(zip(verts[:-1], verts[1:]))
         return cls(verts, edges)
         
     @classmethod
@@ -112,7 +121,7 @@ class GraphObject(object):
         @return: A cycle graph of length I{length}.  
         """
         verts = range(length)
-        edges = [(i, i+1) for i in range(length - 1)] + [(0, length - 1)]
+        edges = [(i, (i+1) % length) for i in verts]        ## the last pair closes the cycle, no list concatenation needed
         return cls(verts, edges)
         
     @classmethod
@@ -135,19 +144,21 @@ class GraphObject(object):
         @rtype: An object of type cls.
         @return: The graph obtained by making vertex I{v1} in graph I{g1} equal to vertex I{v2} in graph I{g2}.  
         """
-        verts = g1.vertices
-        tmpVerts = g2.vertices
-        tmpVerts.remove(v2)
+        verts = list(g1.vertices)
         offset = max(verts) + 1
-        vertDict = dict([(v2, v1)] + [(u, u+offset) for u in tmpVerts])
-        edges = g1.edges + [(vertDict[u], vertDict[v]) for u, v in g2.edges]
-        return cls(verts + [vertDict[u] for u in tmpVerts], edges)
+        vertDict = dict([(u, u+offset) for u in g2.vertices])
+        vertDict[v2] = v1
+        verts += [vertDict[u] for u in g2.vertices if u != v2]
+        edges = list(g1.edges) + [(vertDict[u], vertDict[v]) for u, v in g2.edges]
+        return cls(verts, edges)
         
     @classmethod
     def collapseEdge(cls, g1, a, b):
         """
         Makes the graph minor of I{g1} that results from collapsing edge  I{(a,b)} in I{g1}. 
-        The new vertex is named I{a}. 
+        The new vertex is named I{a}. Edges that would be duplicated by the collapse are only kept once. 
+        Renamed edges stay where they were in the edge list rather than moving to the end, so collapsing 
+        I{(2,5)} in edges C{[(2,5), (3,5), (1,4)]} gives C{[(2,3), (1,4)]}. 
         
         @type cls: A subclass of B{GraphObject}. 
         @param cls: The class of object we wish to create.
@@ -160,16 +171,22 @@ class GraphObject(object):
         @rtype: An object of type cls.
         @return: The graph minor obtained by collapsing edge I{(a,b)} in graph I{g1}.  
         """
-        if g1.hasEdge(a, b):
-            verts = g1.vertices
-            verts.remove(b)
-            useEdges = g1.edges
-            edges = [(u, v) for u, v in useEdges if u!=b and v!=b]
-            edges += [(u, a) for u, v in useEdges if u!=a and v==b]
-            edges += [(a,v) for u, v in useEdges if u==b and a!=v]
-            return cls(verts, edges)
-        else:
+        if not g1.hasEdge(a, b):
             return g1
+        verts = [v for v in g1.vertices if v != b]
+        edges = []
+        seen = set()
+        for u, v in g1.edges:       ## a single pass renames b to a and drops duplicates
+            if u == b or v == b:
+                u = a if u == b else u
+                v = a if v == b else v
+                if u == v:          ## this was the collapsed edge itself
+                    continue
+            ee = (u, v) if u <= v else (v, u)
+            if ee not in seen:
+                seen.add(ee)
+                edges.append(ee)
+        return cls(verts, edges)
         
         
     @classmethod
@@ -211,6 +228,8 @@ class Graph1(GraphObject):
     @ivar vertices: the vertices of the graph
     @ivar edges: the edges of the graph
     """
+    __slots__ = ('vertices', 'edges', '_vertSet', '_edgeSet', '_csr')
+    
     def __init__(self, vertices, edges):
         """
         Graph initialization.      
@@ -222,8 +241,11 @@ class Graph1(GraphObject):
         @rtype: An object of type Graph1.
         @return: A graph.  
         """
-        self.vertices = vertices                                ## a list of ints
-        self.edges = [(min(x), max(x)) for x in edges]          ## a list of int-pairs, least first
+        self.vertices = list(vertices)                          ## a list of ints
+        self.edges = [(a, b) if a <= b else (b, a) for a, b in edges]   ## a list of int-pairs, least first
+        self._vertSet = set(self.vertices)                      ## the same ints, for O(1) membership tests
+        self._edgeSet = set(self.edges)                         ## the same int-pairs, for O(1) membership tests
+        self._csr = None                                        ## CSR arrays for traversals, rebuilt after any mutation
             
         
     def __len__(self):
@@ -264,8 +286,8 @@ class Graph1(GraphObject):
         @rtype: Boolean
         @return: True iff the given vertex is a  vertex of this graph. 
         """
-        return a in self.vertices
-        
+        return a in self._vertSet
+
     def hasEdge(self, a, b):
         """
         Determines if an edge is present in the graph. 
@@ -277,9 +299,8 @@ class Graph1(GraphObject):
         @rtype: Boolean
         @return: True iff the given edge I{(a,b)} is an edge of this graph. 
         """
-        aa = min(a,b)
-        bb = max(a,b)
-        return (aa, bb) in self.edges
+        aa, bb = (a, b) if a <= b else (b, a)
+        return (aa, bb) in self._edgeSet
         
     def addVertex(self, a):
         """
@@ -291,7 +312,9 @@ class Graph1(GraphObject):
         @return: Nothing, no return value is necessary. 
         """
         self.vertices.append(a)
-        
+        self._vertSet.add(a)
+        self._csr = None
+
     def addVertexCleanly(self, a):
         """
         Adds a vertex to the graph. This checks if it is already present and only adds it if it is not present.
@@ -301,8 +324,10 @@ class Graph1(GraphObject):
         @rtype: Boolean
         @return: True iff the vertex was actually added to the graph. 
         """
-        if a not in self.vertices:
+        if a not in self._vertSet:
             self.vertices.append(a)
+            self._vertSet.add(a)
+            self._csr = None
             return True
         return False
  
@@ -316,11 +341,13 @@ class Graph1(GraphObject):
         @rtype: None
         @return: Nothing, no return value is necessary. 
         """
-        try:        ## If a is not present a ValueError is raised
+        if a in self._vertSet:
+            self._csr = None
             self.vertices.remove(a)
+            if a not in self.vertices:      ## addVertex may have listed it twice, as before only one copy goes
+                self._vertSet.discard(a)
             self.edges = [ee for ee in self.edges if a not in ee]
-        except ValueError:      ## this requires no response
-            pass
+            self._edgeSet = set(self.edges)
         
     def addEdge(self, a, b):
         """
@@ -335,18 +362,14 @@ class Graph1(GraphObject):
         @return: True iff the edge was actually added to the graph. 
         """
         if not self.hasEdge(a,b):
-            if a in self.vertices and b in self.vertices:
-                self.edges.append((min(a,b), max(a,b)))
-            elif a in self.vertices:
-                self.addVertex(b)
-                self.edges.append((min(a,b), max(a,b)))
-            elif b in self.vertices:
-                self.addVertex(a)
-                self.edges.append((min(a,b), max(a,b)))
-            else:
+            if a not in self._vertSet:
                 self.addVertex(a)
+            if b not in self._vertSet:
                 self.addVertex(b)
-                self.edges.append((min(a,b), max(a,b)))
+            ee = (a, b) if a <= b else (b, a)
+            self.edges.append(ee)
+            self._edgeSet.add(ee)
+            self._csr = None
             return True
         return False
             
@@ -359,8 +382,41 @@ class Graph1(GraphObject):
         @rtype: None
         @return: None
         """
-        for ee in newEdges:
-            self.addEdge(*ee)   ## the * is needed to unpack the pair ee
+        self.addEdgesBulk(newEdges)
+        
+    def addEdgesBulk(self, edges):
+        """
+        Adds many edges to the graph in one step. This has the same effect as calling I{addEdge} 
+        on each pair in turn, but the new vertices and edges are collected first and then 
+        appended with a single I{extend} each. Nothing is changed until every pair has been 
+        read, so a bad pair leaves the graph as it was. 
+        
+        @type edges: An iterable of pairs of int.
+        @param edges: pairs comprising new edges.
+        @rtype: None
+        @return: None
+        """
+        vertSet = self._vertSet
+        edgeSet = self._edgeSet
+        newVerts = []
+        newEdges = []
+        seenVerts = set()               ## the new ones so far, kept apart until the batch is read
+        seenEdges = set()
+        for a, b in edges:
+            ee = (a, b) if a <= b else (b, a)
+            if ee not in edgeSet and ee not in seenEdges:       ## also skips repeats within edges
+                seenEdges.add(ee)
+                newEdges.append(ee)
+                for v in (a, b):
+                    if v not in vertSet and v not in seenVerts:
+                        seenVerts.add(v)
+                        newVerts.append(v)
+        self.vertices.extend(newVerts)
+        self.edges.extend(newEdges)
+        vertSet.update(seenVerts)
+        edgeSet.update(seenEdges)
+        if newEdges:
+            self._csr = None
             
     def deleteEdge(self, a, b):
         """
@@ -373,12 +429,12 @@ class Graph1(GraphObject):
         @rtype: None
         @return: Nothing, no return value is necessary. 
         """
-        aa = min(a,b)
-        bb = max(a,b)
-        try:
+        aa, bb = (a, b) if a <= b else (b, a)
+        if (aa, bb) in self._edgeSet:   ## no action taken if the edge doesn't exist
+            self._csr = None
             self.edges.remove((aa, bb))
-        except ValueError:  ## no action taken here as the edge doesn't exist
-            pass
+            if (aa, bb) not in self.edges:      ## the edge list may hold it twice, as before only one copy goes
+                self._edgeSet.discard((aa, bb))
         
     def degree(self, v):
         """
@@ -393,73 +449,97 @@ class Graph1(GraphObject):
         
     def degreeFn(self):
         """
-        Computes the degree of all vertices.
+        Computes the degree of all vertices. 
+        This counts endpoints in a single pass over the edges rather than calling I{degree} for each vertex.
         
         @rtype: dict of int:int pairs
         @return: a dict taking a vertex to the degree of that vertex. 
         """
-        return dict([(v, self.degree(v)) for v in self.vertices])
+        import collections
+        counts = collections.Counter([a for a, b in self.edges])
+        counts.update([b for a, b in self.edges if a != b])     ## a loop is counted once, as in degree
+        return dict([(v, counts[v]) for v in self.vertices])
+        
+    def csr(self):
+        """
+        The graph in compressed sparse row form, see B{Graph3}. This is built on first use 
+        and kept until the graph is next changed. 
+        
+        @rtype: A pair of arrays of int.
+        @return: The I{indptr} and I{indices} arrays, with vertices numbered by their first position in I{vertices}. 
+        """
+        if self._csr is None:
+            verts, index, indptr, indices = _buildCSR(self.vertices, self.edges)
+            self._csr = (indptr, indices)
+        return self._csr
         
     def isConnected1(self):
         """
         Determines if the graph is connected, ie there is at least one path between any two vertices. 
-        The method used is bucketing using direct computation to merge buckets.
-        All vertices in a single component end up in a single bucket. 
+        The method used is a breadth first search over the compressed sparse row form of the graph, 
+        see I{csr} and I{_bfsReach}. Neighbour lists sit back to back in two flat arrays, 
+        so the search reads memory in order rather than chasing pointers to edge tuples. 
         
-        Finally the graph is connected iff there is only one bucket. 
+        Finally the graph is connected iff the search reaches every vertex. 
         
         @rtype: Boolean
         @return: True iff the graph is connected. 
         """
-        buckets = dict([(v,v) for v in self.vertices])
-        change = 1
-        while change:
-            change = 0
-            for ee in self.edges:
-                if buckets[ee[0]]!=buckets[ee[1]]:
-                    change = 1
-                    tmp = buckets[ee[1]]
-                    for vv in buckets:
-                        if buckets[vv] == tmp:
-                            buckets[vv] = buckets[ee[0]]
-                            
-        return len(set(buckets.values())) == 1
+        indptr, indices = self.csr()
+        n = len(indptr) - 1
+        return n > 0 and _bfsReach(indptr, indices) == n        ## an empty graph is not connected
         
     def isConnected2(self):
         """
         Determines if the graph is connected, ie there is at least one path between any two vertices. 
         The method used is bucketing using a find-union process to merge buckets. 
+        Vertices are first renumbered 0..n-1 so that the find-union pass in I{_componentCount} 
+        can work on a plain list rather than a dict. 
         
         Finally the graph is connected iff there is only one bucket. 
         
         @rtype: Boolean
         @return: True iff the graph is connected. 
         """
-        buckets=dict([(v, v) for v in self.vertices])
-        def find(v):
-            ff = buckets[v]
-            if ff == v:
-                ## print "one :", v
-                return v
-            else:
-                f2 = find(ff)
-                buckets[v] = f2
-                ## print "two:", v, f2
-                return f2
-                
-        change = 1
-        valuesCnt = len(self.vertices)
-        while change:
-            change = 0
-            for ee in self.edges:
-                ff = find(ee[0])
-                gg = find(ee[1])
-                if ff!=gg:
-                    change = 1
-                    valuesCnt -= 1
-                    buckets[gg] = ff
-                    
-        return valuesCnt == 1
+        index = _positionIndex(self.vertices)
+        edges = [(index[a], index[b]) for a, b in self.edges]
+        return _componentCount(edges, len(index)) == 1
+        
+    def isConnectedUF(self):
+        """
+        Determines if the graph is connected, ie there is at least one path between any two vertices. 
+        The method used is a disjoint-set union over vertex positions 0..n-1, with union by rank 
+        and path halving. Each edge is read exactly once and the working set is two int lists. 
+        The edges are handed to I{_unionFindCount} as two parallel lists of endpoints. 
+        
+        Finally the graph is connected iff there is only one bucket. 
+        
+        @rtype: Boolean
+        @return: True iff the graph is connected. 
+        """
+        index = _positionIndex(self.vertices)
+        edgesU = [index[a] for a, b in self.edges]
+        edgesV = [index[b] for a, b in self.edges]
+        return _unionFindCount(len(index), edgesU, edgesV) == 1
+        
+    def isConnected3(self):
+        """
+        Determines if the graph is connected, ie there is at least one path between any two vertices. 
+        The method used is SciPy's compiled breadth_first_order over the compressed sparse row form, 
+        see I{csr} and I{_scipyCSR}, so no Python code runs per vertex. This needs SciPy, 
+        which is imported only when the method is called. 
+        
+        Finally the graph is connected iff the search reaches every vertex. 
+        
+        @rtype: Boolean
+        @return: True iff the graph is connected. 
+        """
+        from scipy.sparse.csgraph import breadth_first_order
+        n = len(self.csr()[0]) - 1
+        if n == 0:
+            return False                ## an empty graph is not connected
+        order = breadth_first_order(_scipyCSR(self), 0, directed=False, return_predecessors=False)
+        return order.size == n
                     
         
                             
@@ -469,8 +549,10 @@ class Graph2(GraphObject):
     """
     A graph object implemented as an adjacency dict.
     
-    @ivar graph: a dictionary of vertex:list of adjacent vertices pairs. 
+    @ivar graph: a dictionary of vertex:set of adjacent vertices pairs. 
     """
+    __slots__ = ('graph', '_edgeCache')
+    
     def __init__(self, vertices, edges):
         """
         Graph initialization.      
@@ -482,25 +564,27 @@ class Graph2(GraphObject):
         @rtype: An object of type Graph2.
         @return: A graph.  
         """
-        self.graph = dict([(v, []) for v in vertices])          ## a dict int:list of int
+        self.graph = dict([(v, set()) for v in vertices])       ## a dict int:set of int
         for ee in edges:
-            self.graph[ee[0]].append(ee[1])
-            self.graph[ee[1]].append(ee[0])
+            self.graph[ee[0]].add(ee[1])
+            self.graph[ee[1]].add(ee[0])
+        self._edgeCache = None                                  ## the edges property, rebuilt after any mutation
         
     @property
     def vertices(self):
         """
         A list of all vertices.
         """
-        return self.graph.keys()
+        return list(self.graph.keys())
         
     @property
     def edges(self):
         """
-        A list of all edges.
+        A list of all edges. This is cached between mutations, so it should be treated as read-only.
         """
-        edges = [(u, v) for u in self.graph.keys() for v in self.graph[u] if u < v]
-        return edges
+        if self._edgeCache is None:
+            self._edgeCache = [(u, v) for u in self.graph for v in self.graph[u] if u < v]
+        return self._edgeCache
     
     def __len__(self):
         """
@@ -515,19 +599,13 @@ class Graph2(GraphObject):
         """
         A simple string representation of the graph as vertices followed by edges.
         """
-        edges = []
-        for vv in self.graph:
-            edges += [(uu, vv) for uu in self.graph[vv] if uu<vv]
-        return "Vertices: " + str(self.graph.keys()) + "\nEdges: " + str(edges)
+        return "Vertices: " + str(self.vertices) + "\nEdges: " + str(self.edges)
         
     def __str__(self):
         """
         A simple string representation of the graph as vertices followed by edges.
         """
-        edges = []
-        for vv in self.graph:
-            edges += [(uu, vv) for uu in self.graph[vv] if uu<vv]
-        return "Vertices: " + str(self.graph.keys()) + "\nEdges: " + str(edges)
+        return "Vertices: " + str(self.vertices) + "\nEdges: " + str(self.edges)
         
     def copy(self):
         """
@@ -558,7 +636,7 @@ class Graph2(GraphObject):
         @rtype: Boolean
         @return: True iff the given edge I{(a,b)} is an edge of this graph. 
         """
-        return a in self.graph and b in self.graph[a]
+        return b in self.graph.get(a, ())
         
     def addVertex(self, a):
         """
@@ -570,7 +648,8 @@ class Graph2(GraphObject):
         @rtype: None
         @return: Nothing, no return value is necessary. 
         """
-        self.graph[a] = []
+        self.graph[a] = set()
+        self._edgeCache = None
         
     def addVertexCleanly(self, a):
         """
@@ -582,7 +661,7 @@ class Graph2(GraphObject):
         @return: True iff the vertex was actually added to the graph. 
         """
         if a not in self.graph:
-            self.graph[a] = []
+            self.graph[a] = set()
             return True
         return False
         
@@ -595,13 +674,11 @@ class Graph2(GraphObject):
         @rtype: None
         @return: Nothing, no return value is necessary. 
         """
-        try:
-            otherVerts = self.graph[a][:]
-            del self.graph[a]
-            for xx in otherVerts:
-                self.graph[xx].remove(a)
-        except KeyError:
-            pass
+        if a in self.graph:
+            self._edgeCache = None
+            for xx in self.graph.pop(a):
+                if xx != a:         ## a loop at a has already gone with a
+                    self.graph[xx].discard(a)
         
     def addEdge(self, a, b):
         """
@@ -617,17 +694,18 @@ class Graph2(GraphObject):
         """
         if not self.hasEdge(a,b):
             if a in self.graph and b in self.graph:
-                self.graph[a].append(b)
-                self.graph[b].append(a)
+                self.graph[a].add(b)
+                self.graph[b].add(a)
             elif a in self.graph:
-                self.graph[a].append(b)
-                self.graph[b] = [a]
+                self.graph[a].add(b)
+                self.graph[b] = set([a])
             elif b in self.graph:
-                self.graph[a] = [b]
-                self.graph[b].append(a)
+                self.graph[a] = set([b])
+                self.graph[b].add(a)
             else:
-                self.graph[a] = [b]
-                self.graph[b] = [a]
+                self.graph[a] = set([b])
+                self.graph[b] = set([a])
+            self._edgeCache = None
             return True       
         return False
             
@@ -654,11 +732,10 @@ class Graph2(GraphObject):
         @rtype: None
         @return: Nothing, no return value is necessary. 
         """
-        try:
-            self.graph[a].remove(b)
-            self.graph[b].remove(a)
-        except ValueError:
-            pass
+        if self.hasEdge(a, b):      ## no action taken if the edge doesn't exist
+            self._edgeCache = None
+            self.graph[a].discard(b)
+            self.graph[b].discard(a)
         
     def degree(self, v):
         """
@@ -683,120 +760,570 @@ class Graph2(GraphObject):
     def isConnected1(self):
         """
         Determines if the graph is connected, ie there is at least one path between any two vertices. 
-        The method used is bucketing using direct computation to merge buckets.
-        All vertices in a single component end up in a single bucket. 
+        The method used is a breadth first search from an arbitrary vertex, which reads the 
+        adjacency sets directly so each vertex and edge is visited once. 
         
-        Finally the graph is connected iff there is only one bucket. 
+        Finally the graph is connected iff the search reaches every vertex. 
         
         @rtype: Boolean
         @return: True iff the graph is connected. 
         """
-        buckets = dict([(v,v) for v in self.graph])
-        change = 1
-        while change:
-            change = 0
-            for u in self.graph:
-                newComp = [buckets[v] for v in self.graph[u] if buckets[u]!=buckets[v]]
-                if len(newComp):
-                     change = 1
-                     for vv in buckets:
-                        if buckets[vv] in newComp:
-                            buckets[vv] = buckets[u]
-                            
-        return len(set(buckets.values())) == 1
+        import collections
+        if not self.graph:
+            return False            ## as for the other methods, an empty graph is not connected
+        start = next(iter(self.graph))
+        seen = set([start])
+        queue = collections.deque([start])
+        while queue:
+            u = queue.popleft()
+            for v in self.graph[u]:
+                if v not in seen:
+                    seen.add(v)
+                    queue.append(v)
+        return len(seen) == len(self.graph)
 
     def isConnected2(self):
         """
         Determines if the graph is connected, ie there is at least one path between any two vertices. 
         The method used is bucketing using a find-union process to merge buckets. 
+        Vertices are first renumbered 0..n-1 so that the find-union pass in I{_componentCount} 
+        can work on a plain list rather than a dict. 
         
         Finally the graph is connected iff there is only one bucket. 
         
         @rtype: Boolean
         @return: True iff the graph is connected. 
         """
-        buckets=dict([(v, v) for v in self.graph])
-        valuesCnt = len(self.graph)
-        def find(v):
-            ff = buckets[v]
-            if ff == v:
-                ## print "one :", v
-                return v
-            else:
-                f2 = find(ff)
-                buckets[v] = f2
-                ## print "two:", v, f2
-                return f2
-                
-        change = 1
-        while change:
-            change = 0
-            for u in self.graph:
-                for v in self.graph[u]:
-                    ff = find(u)
-                    gg = find(v)
-                    if ff!=gg:
-                        change = 1
-                        valuesCnt -= 1
-                        buckets[gg] = ff
-                    
+        index = dict([(v, i) for i, v in enumerate(self.graph)])
+        edges = [(index[u], index[v]) for u, v in self.edges]
+        return _componentCount(edges, len(index)) == 1
+        
+
+
+class Graph3(GraphObject):
+    """
+    A graph object implemented in compressed sparse row (CSR) form. The vertex at 
+    position i of I{vertices} has the neighbours whose positions are 
+    C{indices[indptr[i]:indptr[i+1]]}. 
+    
+    Both arrays are flat typed arrays, so neighbour lists sit back to back in memory 
+    rather than in one Python list per vertex. This suits read-mostly work such as 
+    degree and connectivity queries. The price is that every mutation that touches 
+    the edges rebuilds the arrays in O(V+E), so it is best to build a Graph3 in one go, 
+    eg with a factory method or with I{addEdges}, rather than edge by edge.
+    
+    @ivar vertices: the vertices of the graph, in position order
+    @ivar indptr: an array of V+1 offsets into I{indices}
+    @ivar indices: an array of the positions of the neighbours of every vertex, back to back
+    """
+    __slots__ = ('vertices', 'indptr', 'indices', '_index')
+    
+    def __init__(self, vertices, edges):
+        """
+        Graph initialization.      
+        
+        @type vertices: A list of int. 
+        @param vertices: The vertices of the graph.
+        @type edges: A list of pairs of int.
+        @param edges: The edges of the graph. Duplicate edges are only stored once.
+        @rtype: An object of type Graph3.
+        @return: A graph.  
+        """
+        self._build(vertices, edges)
+        
+    def _build(self, vertices, edges):
+        """
+        Builds the CSR arrays with I{_buildCSR}.
+        
+        @type vertices: A list of int. 
+        @param vertices: The vertices of the graph.
+        @type edges: A list of pairs of int.
+        @param edges: The edges of the graph. Endpoints missing from I{vertices} are added.
+        @rtype: None
+        @return: Nothing, no return value is necessary. 
+        """
+        self.vertices, self._index, self.indptr, self.indices = _buildCSR(vertices, edges)
+        
+    @property
+    def edges(self):
+        """
+        A list of all edges.
+        """
+        verts = self.vertices
+        indptr = self.indptr
+        indices = self.indices
+        edges = [(verts[i], verts[j]) for i in range(len(verts)) 
+                 for j in indices[indptr[i]:indptr[i+1]] if i <= j]
+        return [(a, b) if a <= b else (b, a) for a, b in edges]     ## least first, as in Graph1
+        
+    def __len__(self):
+        """
+        The size of the graph as given by the number of vertices.      
+        
+        @rtype: int
+        @return: The number of vertices of the graph.  
+        """
+        return len(self.vertices)
+        
+    def __repr__(self):
+        """
+        A simple string representation of the graph as vertices followed by edges.
+        """
+        return "Vertices: " + str(self.vertices) + "\nEdges: " + str(self.edges)
+        
+    def __str__(self):
+        """
+        A simple string representation of the graph as vertices followed by edges.
+        """
+        return "Vertices: " + str(self.vertices) + "\nEdges: " + str(self.edges)
+        
+    def copy(self):
+        """
+        A copy of the graph. This is different from the classmethod in that it 
+        copies into the same type. 
+        """
+        return Graph3(self.vertices, self.edges)
+        
+    def neighbours(self, a):
+        """
+        Lists the vertices adjacent to a vertex. 
+        
+        @type a:int
+        @param a: a vertex of the graph.
+        @rtype: list of int
+        @return: the neighbours of I{a}. 
+        """
+        ia = self._index[a]
+        return [self.vertices[j] for j in self.indices[self.indptr[ia]:self.indptr[ia+1]]]
+        
+    def hasVertex(self, a):
+        """
+        Determines if a vertex is present in the graph. 
+        
+        @type a:int
+        @param a: the name of a possible vertex.
+        @rtype: Boolean
+        @return: True iff the given vertex is a  vertex of this graph. 
+        """
+        return a in self._index
+        
+    def hasEdge(self, a, b):
+        """
+        Determines if an edge is present in the graph. 
+        
+        @type a:int
+        @param a: the name of a possible vertex.
+        @type b:int
+        @param b: the name of a possible vertex.
+        @rtype: Boolean
+        @return: True iff the given edge I{(a,b)} is an edge of this graph. 
+        """
+        import bisect
+        if a not in self._index or b not in self._index:
+            return False
+        ia, ib = self._index[a], self._index[b]
+        lo, hi = self.indptr[ia], self.indptr[ia+1]
+        k = bisect.bisect_left(self.indices, ib, lo, hi)        ## each row is sorted, see _buildCSR
+        return k < hi and self.indices[k] == ib
+        
+    def addVertex(self, a):
+        """
+        Adds a vertex to the graph. A new vertex has no edges, so this only appends an 
+        empty row and does not rebuild the arrays. Adding a vertex that is already 
+        present does nothing.
+        
+        @type a:int
+        @param a: the name of a possible vertex.
+        @rtype: None
+        @return: Nothing, no return value is necessary. 
+        """
+        self.addVertexCleanly(a)
+        
+    def addVertexCleanly(self, a):
+        """
+        Adds a vertex to the graph. This checks if it is already present and only adds it if it is not present.
+        
+        @type a:int
+        @param a: the name of a possible vertex.
+        @rtype: Boolean
+        @return: True iff the vertex was actually added to the graph. 
+        """
+        if a not in self._index:
+            self._index[a] = len(self.vertices)
+            self.vertices.append(a)
+            self.indptr.append(self.indptr[-1])
+            return True
+        return False
+        
+    def deleteVertex(self, a):
+        """
+        Deletes a vertex to the graph. This rebuilds the arrays.
+        
+        @type a:int
+        @param a: the name of a possible vertex to remove.
+        @rtype: None
+        @return: Nothing, no return value is necessary. 
+        """
+        if a in self._index:
+            self._build([v for v in self.vertices if v != a], 
+                        [ee for ee in self.edges if a not in ee])
         
-        return valuesCnt == 1
+    def addEdge(self, a, b):
+        """
+        Adds an edge to the graph. This checks if it is already present and only adds it if it is not present.
+        Missing endpoints are added as well. This rebuilds the arrays.
         
+        @type a:int
+        @param a: the name of a possible vertex.
+        @type b:int
+        @param b: the name of a possible vertex such that I{(a,b)} is the new edge.
+        @rtype: Boolean
+        @return: True iff the edge was actually added to the graph. 
+        """
+        if not self.hasEdge(a,b):
+            self._build(self.vertices, self.edges + [(a, b)])
+            return True
+        return False
+            
+    def addEdges(self, *newEdges):
+        """
+        Adds many edges to the graph with a single rebuild of the arrays.  
+        
+        @type newEdges: unpacked list of pairs of ints (internally it is a list but we don't see that).
+        @param newEdges: pairs comprising new edges.
+        @rtype: None
+        @return: None
+        """
+        self._build(self.vertices, self.edges + list(newEdges))
+            
+    def deleteEdge(self, a, b):
+        """
+        Deletes an edge of the graph. This rebuilds the arrays.
+        
+        @type a:int
+        @param a: the name of one endpoint of the edge to remove.
+        @type b:int
+        @param b: the name of the other endpoint of the edge to remove.
+        @rtype: None
+        @return: Nothing, no return value is necessary. 
+        """
+        if self.hasEdge(a, b):      ## no action taken if the edge doesn't exist
+            self._build(self.vertices, 
+                        [(u, v) for u, v in self.edges if (u, v) != (a, b) and (u, v) != (b, a)])
+        
+    def degree(self, v):
+        """
+        Computes the degree of a vertex, ie the number of edges coming out of the vertex.
+        
+        @type v: int
+        @param v: a vertex whose degree is to be computed.
+        @rtype: int
+        @return: the degree of I{v}.
+        """
+        iv = self._index[v]
+        return self.indptr[iv+1] - self.indptr[iv]
+        
+    def degreeFn(self):
+        """
+        Computes the degree of all vertices.
+        
+        @rtype: dict of int:int pairs
+        @return: a dict taking a vertex to the degree of that vertex. 
+        """
+        indptr = self.indptr
+        return dict([(v, indptr[i+1] - indptr[i]) for i, v in enumerate(self.vertices)])
+        
+    def isConnected1(self):
+        """
+        Determines if the graph is connected, ie there is at least one path between any two vertices. 
+        The method used is a breadth first search from the first vertex that walks the 
+        neighbour slices of I{indices} directly, see I{_bfsReach}. 
+        
+        Finally the graph is connected iff the search reaches every vertex. 
+        
+        @rtype: Boolean
+        @return: True iff the graph is connected. 
+        """
+        n = len(self.vertices)
+        return n > 0 and _bfsReach(self.indptr, self.indices) == n     ## an empty graph is not connected
+        
+    def isConnected2(self):
+        """
+        Determines if the graph is connected, ie there is at least one path between any two vertices. 
+        The method used is bucketing using a find-union process to merge buckets. 
+        Vertex positions are already 0..n-1, so the edges are passed to I{_componentCount} as they are. 
+        
+        Finally the graph is connected iff there is only one bucket. 
+        
+        @rtype: Boolean
+        @return: True iff the graph is connected. 
+        """
+        n = len(self.vertices)
+        indptr = self.indptr
+        indices = self.indices
+        edges = [(i, j) for i in range(n) for j in indices[indptr[i]:indptr[i+1]] if i < j]
+        return _componentCount(edges, n) == 1
+        
+
+
+def _positionIndex(vertices):
+    """
+    Numbers the distinct vertices 0..n-1 in the order they first appear, so the connectivity 
+    kernels can work on plain lists. A vertex listed more than once, as I{addVertex} allows, 
+    keeps its first position. 
+    
+    @type vertices: A list of int. 
+    @param vertices: The vertices of the graph.
+    @rtype: A dict of int:int.
+    @return: A dict taking each vertex to its position. 
+    """
+    index = {}
+    for v in vertices:
+        index.setdefault(v, len(index))
+    return index
+
+
+def _buildCSR(vertices, edges):
+    """
+    Builds the compressed sparse row form of a graph with a counting sort: count the degrees, 
+    turn the counts into offsets with a running sum, then scatter each neighbour into its slot. 
+    Duplicate vertices and edges are only stored once, and the neighbours in each row are sorted, 
+    so a row is read in order and can be searched with I{bisect}. 
+    
+    @type vertices: A list of int. 
+    @param vertices: The vertices of the graph.
+    @type edges: A list of pairs of int.
+    @param edges: The edges of the graph. Endpoints missing from I{vertices} are added.
+    @rtype: A tuple of a list, a dict and two arrays.
+    @return: The vertices in position order, a dict taking each vertex to its position, and the 
+    I{indptr} and I{indices} arrays, so that the neighbours of position i are C{indices[indptr[i]:indptr[i+1]]}. 
+    """
+    import array
+    verts = []
+    index = {}
+    for v in vertices:
+        if v not in index:
+            index[v] = len(verts)
+            verts.append(v)
+    pairs = set()
+    for a, b in edges:
+        for v in (a, b):
+            if v not in index:
+                index[v] = len(verts)
+                verts.append(v)
+        ia, ib = index[a], index[b]
+        pairs.add((ia, ib) if ia <= ib else (ib, ia))
+    n = len(verts)
+    indptr = [0] * (n + 1)
+    for ia, ib in pairs:
+        indptr[ia + 1] += 1
+        if ia != ib:
+            indptr[ib + 1] += 1
+    for i in range(n):
+        indptr[i + 1] += indptr[i]
+    fill = indptr[:-1]                                          ## the next free slot of each row
+    indices = [0] * indptr[n]
+    for ia, ib in sorted(pairs):    ## in pair order every row fills in ascending order
+        indices[fill[ia]] = ib
+        fill[ia] += 1
+        if ia != ib:
+            indices[fill[ib]] = ia
+            fill[ib] += 1
+    code = 'i' if max(n, indptr[n]) < 2**31 else 'q'           ## 4-byte ints whenever every offset fits, else 8-byte on every platform
+    return verts, index, array.array(code, indptr), array.array(code, indices)
+
+
+def _bfsReach(indptr, indices, alpha=14, beta=24, density=4):
+    """
+    Counts the vertices reachable from position 0 of a graph in compressed sparse row form 
+    with a breadth first search over the neighbour slices. 
+    
+    On dense graphs the search goes level by level and switches direction when the frontier 
+    gets large: instead of every frontier vertex pushing to its neighbours, every unvisited 
+    vertex looks for one visited neighbour and stops at the first it finds (Beamer's 
+    direction-optimizing search). Sparse graphs keep the plain queue, where the per-level 
+    bookkeeping would cost more than it saves. 
+    
+    @type indptr: An array of int.
+    @param indptr: The V+1 row offsets into I{indices}.
+    @type indices: An array of int.
+    @param indices: The neighbour positions of every vertex, back to back.
+    @type alpha: int
+    @param alpha: Go bottom up once the frontier times alpha exceeds the unvisited vertices.
+    @type beta: int
+    @param beta: ... and the frontier times beta exceeds all the vertices.
+    @type density: int
+    @param density: The average degree below which the plain queue is always used.
+    @rtype: int
+    @return: The number of vertices reached, including position 0, or 0 for an empty graph. 
+    """
+    n = len(indptr) - 1
+    if n == 0:
+        return 0
+    visited = [False] * n
+    visited[0] = True
+    if len(indices) < density * n:
+        queue = [0]
+        push = queue.append
+        for u in queue:                 ## the list grows while we walk it, so it acts as the queue
+            for v in indices[indptr[u]:indptr[u+1]]:
+                if not visited[v]:
+                    visited[v] = True
+                    push(v)
+            if len(queue) == n:         ## everything is reached, the rest of the queue has nothing new
+                break
+        return len(queue)
+    frontier = [0]
+    reached = 1
+    unvisited = range(n)
+    growing = True
+    while frontier and reached < n:
+        nxt = []
+        push = nxt.append
+        if growing and len(frontier) * alpha > n - reached and len(frontier) * beta > n:
+            unvisited = [v for v in unvisited if not visited[v]]
+            for v in unvisited:         ## bottom up: one visited neighbour is enough
+                for u in indices[indptr[v]:indptr[v+1]]:
+                    if visited[u]:
+                        visited[v] = True
+                        push(v)
+                        break
+        else:
+            for u in frontier:          ## top down
+                for v in indices[indptr[u]:indptr[u+1]]:
+                    if not visited[v]:
+                        visited[v] = True
+                        push(v)
+        reached += len(nxt)
+        growing = len(nxt) >= len(frontier)    ## once the frontier shrinks, top down is cheaper again
+        frontier = nxt
+    return reached
+
+
+def _componentCount(edges, n):
+    """
+    Counts the connected components of a graph whose vertices are 0..n-1 with a single 
+    find-union pass over the edges. This is the shared kernel behind the I{isConnected2} methods. 
+    The pass stops as soon as a single component is left. 
+    
+    @type edges: A list of pairs of int.
+    @param edges: The edges of the graph, with every endpoint in range(n).
+    @type n: int
+    @param n: The number of vertices.
+    @rtype: int
+    @return: The number of connected components. 
+    """
+    parent = list(range(n))
+    count = n                       ## every successful union merges two components
+    for a, b in edges:
+        ra = a
+        while parent[ra] != ra:
+            ra = parent[ra]
+        while parent[a] != ra:      ## path compression
+            parent[a], a = ra, parent[a]
+        rb = b
+        while parent[rb] != rb:
+            rb = parent[rb]
+        while parent[b] != rb:
+            parent[b], b = rb, parent[b]
+        if ra != rb:
+            parent[rb] = ra
+            count -= 1
+            if count == 1:          ## one component left, the remaining edges cannot change that
+                return 1
+    return count
+
+
+def _unionFindCount(n, edgesU, edgesV):
+    """
+    Counts the connected components of a graph whose vertices are 0..n-1 with a disjoint-set 
+    union using union by rank and path halving. The finds are written inline rather than as 
+    a nested function, so the loop makes no Python calls per edge. The pass stops as soon as a 
+    single component is left. 
+    
+    @type n: int
+    @param n: The number of vertices.
+    @type edgesU: A list of int.
+    @param edgesU: The first endpoint of every edge.
+    @type edgesV: A list of int.
+    @param edgesV: The second endpoint of every edge, in the same order as I{edgesU}.
+    @rtype: int
+    @return: The number of connected components. 
+    """
+    parent = list(range(n))
+    rank = [0] * n
+    count = n                       ## every successful union merges two components
+    for a, b in zip(edgesU, edgesV):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]       ## path halving: skip every other link
+            a = parent[a]
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+        if a != b:
+            if rank[a] < rank[b]:
+                a, b = b, a
+            parent[b] = a
+            if rank[a] == rank[b]:
+                rank[a] += 1
+            count -= 1
+            if count == 1:          ## one component left, the remaining edges cannot change that
+                return 1
+    return count
 
 
 def test(enum=0):
     if enum==1:
         tester = Graph1([1,2,3,4], [(1,2), (2,3), (2,4), (1,4)])
-        print tester
+        print(tester)
         
         tester.addEdge(5,2)
-        print tester
+        print(tester)
         
         tester.deleteVertex(1)
         print(tester)
         
         tester.addEdges((1,3), (4,2), (4,6), (6,5))
-        print tester
+        print(tester)
         
         tester.deleteEdge(5,6)
-        print tester
+        print(tester)
         
-        print tester.degree(2), tester.degree(1)
-        print tester.degreeFn()
+        print(tester.degree(2), tester.degree(1))
+        print(tester.degreeFn())
 
         
     if enum==2:
         tester = Graph2([1,2,3,4], [(1,2), (2,3), (2,4), (1,4)])
-        print tester
+        print(tester)
         
         tester.addEdge(5,2)
-        print tester
+        print(tester)
         
         tester.deleteVertex(1)
         print(tester)
         
         tester.addEdges((1,3), (4,2), (4,6), (6,5))
-        print tester
+        print(tester)
         
         tester.deleteEdge(5,6)
-        print tester
+        print(tester)
         
-        print tester.degree(2), tester.degree(1)
-        print tester.degreeFn()
+        print(tester.degree(2), tester.degree(1))
+        print(tester.degreeFn())
         
     if enum==3:
         tester = Graph1([1,2,3,4], [(1,2), (2,3), (2,4), (1,4)])
-        print tester
-        print tester.isConnected1(), tester.isConnected2()
+        print(tester)
+        print(tester.isConnected1(), tester.isConnected2(), tester.isConnectedUF())
         
         tester2 = Graph1([1,2,3,4,5,6], [(1,3), (4,5), (4,6), (3,2)])
-        print tester2
-        print tester2.isConnected1(), tester2.isConnected2()
+        print(tester2)
+        print(tester2.isConnected1(), tester2.isConnected2(), tester2.isConnectedUF())
         
     if enum==30:
         tester = Graph1([1,2,3,4], [(1,2), (2,3), (2,4), (1,4)])
-        #print tester
+        #print(tester)
         tester.isConnected1()
         
     if enum==31:
@@ -811,19 +1338,28 @@ def test(enum=0):
         tester2 = Graph1([1,2,3,4,5,6], [(1,3), (4,5), (4,6), (3,2)])
         tester2.isConnected2()
         
+    if enum==34:        ## the cases of test 3 for isConnected3, which needs SciPy
+        tester = Graph1([1,2,3,4], [(1,2), (2,3), (2,4), (1,4)])
+        print(tester)
+        print(tester.isConnected1(), tester.isConnected3())
+        
+        tester2 = Graph1([1,2,3,4,5,6], [(1,3), (4,5), (4,6), (3,2)])
+        print(tester2)
+        print(tester2.isConnected1(), tester2.isConnected3())
+        
     if enum==4:
         tester = Graph2([1,2,3,4], [(1,2), (2,3), (2,4), (1,4)])
-        print tester
-        print tester.isConnected1(), tester.isConnected2()
+        print(tester)
+        print(tester.isConnected1(), tester.isConnected2())
                 
         tester2 = Graph1([1,2,3,4,5,6], [(1,3), (4,5), (4,6), (3,2)])
-        print tester2
-        print tester2.isConnected1(), tester2.isConnected2()
+        print(tester2)
+        print(tester2.isConnected1(), tester2.isConnected2())
 
         
     if enum==40:
         tester = Graph2([1,2,3,4], [(1,2), (2,3), (2,4), (1,4)])
-        #print tester
+        #print(tester)
         tester.isConnected1()
         
     if enum==41:
@@ -840,87 +1376,216 @@ def test(enum=0):
         
     if enum==5:
         tester = Graph1.random(12, 45)
-        print tester
-        print len(tester), len(tester.edges), tester.degreeFn()
-        print tester.isConnected1()
+        print(tester)
+        print(len(tester), len(tester.edges), tester.degreeFn())
+        print(tester.isConnected1())
         
     if enum==6:
         tester = Graph2.random(12, 45)
-        print tester
-        print len(tester), sum([tester.degree(v) for v in tester.graph]) / 2, tester.degreeFn()
-        print tester.isConnected1()
+        print(tester)
+        print(len(tester), sum([tester.degree(v) for v in tester.graph]) // 2, tester.degreeFn())
+        print(tester.isConnected1())
         
     if enum==7:
         tester = Graph1.fromFile("graphExample.txt")
-        print tester
-        print len(tester), len(tester.edges), tester.degreeFn()
-        print tester.isConnected1()
+        print(tester)
+        print(len(tester), len(tester.edges), tester.degreeFn())
+        print(tester.isConnected1())
         
     if enum==8:
         tester = Graph2.fromFile("graphExample.txt")
-        print tester
-        print len(tester), sum([tester.degree(v) for v in tester.graph]) / 2, tester.degreeFn()
-        print tester.isConnected1()
+        print(tester)
+        print(len(tester), sum([tester.degree(v) for v in tester.graph]) // 2, tester.degreeFn())
+        print(tester.isConnected1())
 
     if enum==9:
         tests = [Graph1.complete(5), Graph1.path(6), Graph1.cycle(8)]
         for gg in tests: 
-            print gg
+            print(gg)
             
     if enum==10:
         tests = [Graph2.complete(5), Graph2.path(6), Graph2.cycle(8)]
         for gg in tests: 
-            print gg
+            print(gg)
             
     if enum==11:
         test1 = Graph1([1,2,3,4,5], [(1,2), (2,3), (1,4), (2,5), (3,5)])
         test2 = Graph1([1,2,3,5,7], [(1,2), (1,7), (2,3), (2,7), (3,5), (5,7)])
-        print test1, test2
-        print Graph1.joinAtVert(test1, test2, 2, 7)
+        print(test1, test2)
+        print(Graph1.joinAtVert(test1, test2, 2, 7))
         
     if enum==12:
         test1 = Graph2([1,2,3,4,5], [(1,2), (2,3), (1,4), (2,5), (3,5)])
         test2 = Graph2([1,2,3,5,7], [(1,2), (1,7), (2,3), (2,7), (3,5), (5,7)])
-        print test1, test2
-        print Graph2.joinAtVert(test1, test2, 2, 7)
+        print(test1, test2)
+        print(Graph2.joinAtVert(test1, test2, 2, 7))
 
     if enum==13:
         tester = Graph1([1,2,3,4,5], [(1,2), (2,3), (1,4), (2,5), (3,5)])
-        print tester
-        print Graph1.collapseEdge(tester, 2, 5)
+        print(tester)
+        print(Graph1.collapseEdge(tester, 2, 5))
         
     if enum==14:
         tester = Graph2([1,2,3,4,5], [(1,2), (2,3), (1,4), (2,5), (3,5)])
-        print tester
-        print Graph2.collapseEdge(tester, 2, 5)
+        print(tester)
+        print(Graph2.collapseEdge(tester, 2, 5))
+
+    if enum==15:
+        tester = Graph3([1,2,3,4], [(1,2), (2,3), (2,4), (1,4)])
+        print(tester)
+        
+        tester.addEdge(5,2)
+        print(tester)
+        
+        tester.deleteVertex(1)
+        print(tester)
+        
+        tester.addEdges((1,3), (4,2), (4,6), (6,5))
+        print(tester)
+        
+        tester.deleteEdge(5,6)
+        print(tester)
+        
+        print(tester.degree(2), tester.degree(1))
+        print(tester.degreeFn())
+        
+    if enum==16:
+        tester = Graph3([1,2,3,4], [(1,2), (2,3), (2,4), (1,4)])
+        print(tester)
+        print(tester.isConnected1(), tester.isConnected2())
+        
+        tester2 = Graph3([1,2,3,4,5,6], [(1,3), (4,5), (4,6), (3,2)])
+        print(tester2)
+        print(tester2.isConnected1(), tester2.isConnected2())
 
 
+_randomGraphs = {}      ## (vertCount, edgeCount, seed):Graph1, filled by _cachedRandom
+
+def _cachedRandom(vertCount, edgeCount, seed=0):
+    """
+    A memoized I{Graph1.random} for the timing functions, so that repeated timings of one size 
+    pay for generating the graph once. The connectivity methods never change the graph, so 
+    sharing it between timings is safe. 
+    
+    @type vertCount: int
+    @param vertCount: The number of vertices this graph is to have.
+    @type edgeCount: int
+    @param edgeCount: The maximum number of edges this graph is to have.
+    @type seed: hashable
+    @param seed: The seed for the random generator.
+    @rtype: An object of type Graph1.
+    @return: A random graph, the same object for the same arguments.  
+    """
+    key = (vertCount, edgeCount, seed)
+    if key not in _randomGraphs:
+        _randomGraphs[key] = Graph1.random(vertCount, edgeCount, seed)
+    return _randomGraphs[key]
+    
 def timetest1(n=10):
-    tester = Graph1.random(n, 4*n)
-    tester.isConnected1()
+    tester = _cachedRandom(n, 4*n)
+    tester.isConnectedUF()
     
 def timetest2(n=10):
-    tester = Graph1.random(n, 4*n)
+    tester = _cachedRandom(n, 4*n)
     tester.isConnected2()
+    
+def timetest3(n=10):
+    tester = _cachedRandom(n, 4*n)
+    _scipyComponents(_scipyCSR(tester))
+    
+def _scipyCSR(g):
+    """
+    Builds a SciPy sparse matrix on the compressed sparse row arrays of a B{Graph1}, see I{csr}. 
+    NumPy reads the arrays in place through the buffer protocol, so this costs next to nothing. 
+    SciPy is imported here, so the rest of the module does not depend on it. 
+    
+    @type g: An object of type B{Graph1}.
+    @param g: The graph to convert.
+    @rtype: A scipy.sparse.csr_matrix.
+    @return: The V by V adjacency matrix of I{g}. 
+    """
+    import numpy
+    from scipy.sparse import csr_matrix
+    indptr, indices = g.csr()
+    n = len(indptr) - 1
+    data = numpy.ones(len(indices), dtype=numpy.float64)       ## csgraph works in float64, any other dtype is converted on every call
+    return csr_matrix((data, numpy.asarray(indices), numpy.asarray(indptr)), shape=(n, n))     ## views, not copies
+    
+def _scipyComponents(mat):
+    """
+    Counts the connected components of an adjacency matrix with SciPy's compiled 
+    connected_components, the reference the pure Python methods are measured against. 
+    
+    @type mat: A scipy.sparse.csr_matrix.
+    @param mat: A symmetric adjacency matrix, see I{_scipyCSR}.
+    @rtype: int
+    @return: The number of connected components. 
+    """
+    from scipy.sparse.csgraph import connected_components
+    return connected_components(mat, directed=False, return_labels=False)
+    
+def runSize(n, reps=None):
+    """
+    Times both connectivity methods on one random graph with n vertices and 4*n edges, 
+    and SciPy's connected_components on the same graph as a reference when SciPy is installed. 
+    This is a module-level function so that a multiprocessing pool can send it to its workers. 
+    
+    @type n: int
+    @param n: the number of vertices.
+    @type reps: int
+    @param reps: the number of timed calls of each method. By default about 1e6/n, so every 
+    size does roughly the same amount of work.
+    @rtype: tuple of int, float, float, float
+    @return: I{n} and the mean time of one call of I{isConnectedUF}, of I{isConnected2} and of 
+    the SciPy reference, which is None without SciPy.
+    """
+    import timeit
+    if reps is None:
+        reps = max(1, int(1e6 / n))
+    gg = _cachedRandom(n, 4*n)          ## built outside the timed region, so only connectivity is measured
+    try:
+        mat = _scipyCSR(gg)
+    except ImportError:
+        t3 = None                       ## no reference curve
+    else:
+        t3 = timeit.timeit(lambda: _scipyComponents(mat), number=reps) / reps
+    return (n, timeit.timeit(gg.isConnectedUF, number=reps) / reps, 
+               timeit.timeit(gg.isConnected2, number=reps) / reps, t3)
         
         
 if __name__ == '__main__':
-     import timeit
-     x=[]
-     y1=[]
-     y2=[]
+     import multiprocessing
+     import matplotlib
+     matplotlib.use('Agg')               ## no GUI backend, the plot is written to a file
+     import matplotlib.pyplot as plt
      
-     for i in range(1,20):
-         print i
-         x.append(i)
-         y1.append(timeit.timeit("timetest1("+str(10*i) + ")", setup="from __main__ import timetest1"))
-         y2.append(timeit.timeit("timetest2("+str(10*i) + ")", setup="from __main__ import timetest2"))
+     sizes = [int(10 * 1.6**i) for i in range(20)]    ## geometric, from 10 up to about 75000 vertices
+     pool = multiprocessing.Pool()       ## one worker per core, the sizes are independent
+     try:
+         results = pool.map(runSize, sizes)
+     finally:
+         pool.close()
+         pool.join()
+     x = [0] * len(sizes)
+     y1 = [0.0] * len(sizes)
+     y2 = [0.0] * len(sizes)
+     y3 = [None] * len(sizes)
+     for k, (n, t1, t2, t3) in enumerate(results):      ## one pass over the results, filling the slots by index
+         x[k] = n
+         y1[k] = t1
+         y2[k] = t2
+         y3[k] = t3
 #    print(timeit.timeit("test(41)", setup="from __main__ import test"))
 #    print(timeit.timeit("test(42)", setup="from __main__ import test"))
 #    print(timeit.timeit("test(43)", setup="from __main__ import test"))
     
     
-     import matplotlib.pyplot as plt
-    
-     plt.plot(x, y1, 'ro', x, y2, 'b+')
-     plt.show()
\ No newline at end of file
+     fig, ax = plt.subplots()
+     ax.plot(x, y1, 'ro', label='isConnectedUF')
+     ax.plot(x, y2, 'b+', label='isConnected2')
+     if None not in y3:
+         ax.plot(x, y3, 'gx', label='scipy connected_components')
+     ax.set_xscale('log')
+     ax.set_yscale('log')
+     ax.legend()
+     fig.savefig('bench.png', dpi=120)
\ No newline at end of file